@@ -2,26 +2,79 @@
 
 from __future__ import annotations
 
-import io
+import asyncio
+import hashlib
 import logging
+import os
 import re
+import shutil
+import tempfile
+import time
 import uuid
-from collections import Counter
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import torch
+from cachetools import TTLCache
 from fastapi import Body, FastAPI, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pyarrow import csv as pa_csv
+from pyarrow import feather
+from pyarrow import parquet as pq
 from pydantic import BaseModel, Field
-from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+try:  # ONNX Runtime est optionnel : sans lui, on reste sur PyTorch
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    ORTModelForSequenceClassification = None
+
+try:  # Numba est optionnel : sans lui, le comptage passe par numpy.bincount
+    from numba import njit
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    njit = None
 
 
 LOGGER = logging.getLogger("sentiment_analyzer")
 logging.basicConfig(level=logging.INFO)
 
 
+CSV_BLOCK_SIZE = 8 << 20
+CSV_EXPORT_CHUNK_ROWS = 10_000
+PARQUET_EXPORT_CHUNK_ROWS = 50_000
+RESULTS_SCHEMA = pa.schema(
+    [
+        ("text", pa.string()),
+        ("clean_text", pa.string()),
+        ("sentiment", pa.string()),
+        ("score", pa.float64()),
+    ]
+)
+BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+MAX_SEQUENCE_LENGTH = 512
+UPLOAD_DIR = Path(os.getenv("SENTIMENT_UPLOAD_DIR", Path(tempfile.gettempdir()) / "sentiment-analyzer"))
+UPLOAD_MAX_ENTRIES = 32
+UPLOAD_TTL_SECONDS = 3600
+PREDICTION_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "100000"))
+MODEL_NAME = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+ONNX_CACHE_DIR = Path(os.getenv("SENTIMENT_ONNX_CACHE", Path(__file__).resolve().parent / ".onnx_cache"))
+
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+
+_NEWLINE_RE = re.compile(r"[\r\n]+", re.UNICODE)
+_NONWORD_RE = re.compile(r"[^\w\s'’]", re.UNICODE)
+_MULTISPACE_RE = re.compile(r"\s+", re.UNICODE)
+_TOKEN_RE = re.compile(r"\b[\w']+\b", re.UNICODE)
+
 LABEL_TRANSLATIONS = {
     "LABEL_0": "négatif",
     "LABEL_1": "neutre",
@@ -32,60 +85,62 @@ LABEL_TRANSLATIONS = {
 }
 
 
-STOPWORDS = {
-    "les",
-    "des",
-    "une",
-    "avec",
-    "pour",
-    "sur",
-    "que",
-    "qui",
-    "dans",
-    "est",
-    "sont",
-    "par",
-    "vous",
-    "nous",
-    "elles",
-    "ils",
-    "mais",
-    "pas",
-    "plus",
-    "tres",
-    "très",
-    "trop",
-    "cette",
-    "cet",
-    "ces",
-    "une",
-    "au",
-    "aux",
-    "de",
-    "du",
-    "la",
-    "le",
-    "un",
-    "et",
-    "ne",
-    "se",
-    "ce",
-    "ses",
-    "son",
-    "sa",
-    "leur",
-    "leurs",
-    "comme",
-    "toute",
-    "tout",
-    "tous",
-    "faire",
-    "etre",
-    "être",
-    "avoir",
-    "tres",
-    "tres",
-}
+TEXT_COLUMN_KEYWORDS = ("texte", "text", "phrase", "commentaire", "avis", "review", "description")
+
+
+STOPWORDS = frozenset(
+    {
+        "les",
+        "des",
+        "une",
+        "avec",
+        "pour",
+        "sur",
+        "que",
+        "qui",
+        "dans",
+        "est",
+        "sont",
+        "par",
+        "vous",
+        "nous",
+        "elles",
+        "ils",
+        "mais",
+        "pas",
+        "plus",
+        "tres",
+        "très",
+        "trop",
+        "cette",
+        "cet",
+        "ces",
+        "au",
+        "aux",
+        "de",
+        "du",
+        "la",
+        "le",
+        "un",
+        "et",
+        "ne",
+        "se",
+        "ce",
+        "ses",
+        "son",
+        "sa",
+        "leur",
+        "leurs",
+        "comme",
+        "toute",
+        "tout",
+        "tous",
+        "faire",
+        "etre",
+        "être",
+        "avoir",
+    }
+)
 
 
 class AnalyzePayload(BaseModel):
@@ -106,63 +161,236 @@ class UploadResponse(BaseModel):
     detected_column: Optional[str]
 
 
-def get_sentiment_pipeline() -> Any:
-    """Initialise (ou récupère) le pipeline de sentiment."""
-
-    model_name = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
-    LOGGER.info("Chargement du modèle de sentiment %s", model_name)
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForSequenceClassification.from_pretrained(model_name)
-    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
-
-
-PIPELINE = get_sentiment_pipeline()
-
-
-def clean_text(value: str) -> str:
-    text = re.sub(r"[\r\n]+", " ", str(value))
-    text = re.sub(r"[^\w\s'’]", " ", text, flags=re.UNICODE)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+def load_quantized_onnx_model(model_name: str) -> Any:
+    """Exporte le modèle en ONNX quantifié int8 (une seule fois) et le charge."""
+
+    quantized_dir = ONNX_CACHE_DIR / model_name.replace("/", "__")
+    quantized_file = "model_quantized.onnx"
+    if not (quantized_dir / quantized_file).exists():
+        LOGGER.info("Export ONNX et quantification int8 de %s vers %s", model_name, quantized_dir)
+        # Export dans un répertoire temporaire puis publication atomique : un export
+        # interrompu ou concurrent (plusieurs workers) ne laisse pas de fichier partiel.
+        ONNX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix=f".{quantized_dir.name}-", dir=ONNX_CACHE_DIR))
+        try:
+            onnx_model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(onnx_model)
+            quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=staging_dir, quantization_config=quantization_config)
+            try:
+                os.replace(staging_dir, quantized_dir)
+            except OSError:
+                if not (quantized_dir / quantized_file).exists():
+                    raise
+                LOGGER.info("Export ONNX déjà publié par un autre processus")
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    return ORTModelForSequenceClassification.from_pretrained(quantized_dir, file_name=quantized_file)
+
+
+@lru_cache(maxsize=1)
+def get_sentiment_model() -> Tuple[Any, Any]:
+    """Charge (une seule fois) le tokenizer Rust et le modèle de sentiment.
+
+    Sur GPU, les poids sont chargés en FP16. Sur CPU, le modèle ONNX quantifié
+    int8 est utilisé si `optimum[onnxruntime]` est installé, sinon PyTorch FP32
+    sur l'ensemble des cœurs disponibles.
+    """
+
+    LOGGER.info("Chargement du modèle de sentiment %s", MODEL_NAME)
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, use_fast=True)
+    if torch.cuda.is_available():
+        model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME, torch_dtype=torch.float16).to("cuda")
+    elif ORTModelForSequenceClassification is not None:
+        return tokenizer, load_quantized_onnx_model(MODEL_NAME)
+    else:
+        torch.set_num_threads(os.cpu_count() or 1)
+        model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+    model.eval()
+    return tokenizer, model
+
+
+if os.getenv("SENTIMENT_PRELOAD_MODEL"):
+    # Avec `gunicorn --preload`, le modèle est chargé dans le processus parent
+    # et ses poids sont partagés (copy-on-write) entre les workers forkés.
+    # CUDA n'est pas utilisable après un fork : sur GPU, chaque worker charge
+    # son propre modèle au démarrage.
+    if torch.cuda.is_available():
+        LOGGER.warning("SENTIMENT_PRELOAD_MODEL ignoré : préchargement réservé à l'inférence CPU")
+    else:
+        get_sentiment_model()
+
+
+def run_model(texts: List[str]) -> List[Tuple[str, float]]:
+    """Retourne un couple (label, score) par texte, dans l'ordre d'entrée.
+
+    Tous les textes sont tokenisés en un seul appel au tokenizer Rust, puis
+    triés par nombre de tokens afin que chaque lot regroupe des longueurs
+    proches et limite le padding.
+    """
+
+    tokenizer, model = get_sentiment_model()
+    encoded = tokenizer(texts, truncation=True, max_length=MAX_SEQUENCE_LENGTH)
+    input_ids, attention_mask = encoded["input_ids"], encoded["attention_mask"]
+    order = sorted(range(len(texts)), key=lambda index: len(input_ids[index]))
+    id2label = model.config.id2label
+
+    ordered: List[Tuple[str, float]] = [("", 0.0)] * len(texts)
+    with torch.inference_mode():
+        for start in range(0, len(order), BATCH_SIZE):
+            batch = order[start : start + BATCH_SIZE]
+            inputs = tokenizer.pad(
+                {
+                    "input_ids": [input_ids[index] for index in batch],
+                    "attention_mask": [attention_mask[index] for index in batch],
+                },
+                return_tensors="pt",
+            ).to(model.device)
+            scores, label_ids = model(**inputs).logits.float().softmax(dim=-1).max(dim=-1)
+            for index, label_id, score in zip(batch, label_ids.tolist(), scores.tolist()):
+                ordered[index] = (id2label[label_id], score)
+    return ordered
+
+
+PREDICTION_CACHE: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+
+def predict_sentiments(texts: List[str]) -> List[Tuple[str, float]]:
+    """Comme `run_model`, mais sans réinférer les textes déjà vus.
+
+    Les doublons ne passent qu'une fois dans le modèle et les prédictions sont
+    conservées d'un upload à l'autre dans un cache LRU indexé par SHA1.
+    """
+
+    keys = [hashlib.sha1(text.encode("utf-8")).digest() for text in texts]
+    missing = {key: text for key, text in zip(keys, texts) if key not in PREDICTION_CACHE}
+    if missing:
+        for key, prediction in zip(missing, run_model(list(missing.values()))):
+            PREDICTION_CACHE[key] = prediction
+
+    predictions: List[Tuple[str, float]] = []
+    for key in keys:
+        PREDICTION_CACHE.move_to_end(key)
+        predictions.append(PREDICTION_CACHE[key])
+    while len(PREDICTION_CACHE) > PREDICTION_CACHE_SIZE:
+        PREDICTION_CACHE.popitem(last=False)
+    return predictions
+
+
+def clean_series(series: pd.Series) -> pd.Series:
+    """Nettoie une série de textes en conservant son index."""
+
+    return (
+        series.str.replace(_NEWLINE_RE, " ", regex=True)
+        .str.replace(_NONWORD_RE, " ", regex=True)
+        .str.replace(_MULTISPACE_RE, " ", regex=True)
+        .str.strip()
+    )
 
 
 def detect_text_columns(df: pd.DataFrame) -> List[str]:
     candidate_columns: List[str] = []
     for column in df.columns:
         series = df[column]
-        if pd.api.types.is_string_dtype(series) or series.dtype == object:
-            sample = series.dropna().astype(str).head(200)
-            if sample.empty:
-                continue
-            avg_len = sample.map(lambda x: len(x.split())).mean()
-            if avg_len >= 2:
+        if not (
+            pd.api.types.is_string_dtype(series)
+            or series.dtype == object
+            or series.dtype in (pd.ArrowDtype(pa.string()), pd.ArrowDtype(pa.large_string()))
+        ):
+            continue
+        if column.lower() in TEXT_COLUMN_KEYWORDS:
+            # Nom explicite : inutile de calculer des statistiques sur le contenu
+            if series.notna().any():
                 candidate_columns.append(column)
+            continue
+        sample = series.dropna().head(200).astype(str)
+        if sample.empty:
+            continue
+        # La moyenne plafonnée (3 découpes max) minore la vraie moyenne : si elle
+        # atteint déjà le seuil, inutile de découper les valeurs en entier.
+        if (
+            sample.str.split(n=3, regex=False).str.len().mean() >= 2
+            or sample.str.split().str.len().mean() >= 2
+        ):
+            candidate_columns.append(column)
     return candidate_columns
 
 
 def choose_default_column(columns: List[str]) -> Optional[str]:
-    priority_keywords = ["texte", "text", "phrase", "commentaire", "avis", "review", "description"]
     lowered = {col.lower(): col for col in columns}
-    for keyword in priority_keywords:
+    for keyword in TEXT_COLUMN_KEYWORDS:
         if keyword in lowered:
             return lowered[keyword]
     return columns[0] if columns else None
 
 
-def dataframe_from_upload(file: UploadFile, raw_bytes: bytes) -> pd.DataFrame:
-    buffer = io.BytesIO(raw_bytes)
+def _dedupe_column_names(names: List[str]) -> List[str]:
+    """Renomme les en-têtes vides ou dupliqués comme `pd.read_csv` (`Unnamed: 2`, `text.1`)."""
+
+    deduped = [name if name else f"Unnamed: {index}" for index, name in enumerate(names)]
+    counts: Dict[str, int] = {}
+    for index, name in enumerate(deduped):
+        original, current = name, counts.get(name, 0)
+        while current > 0:
+            counts[original] = current + 1
+            name = f"{original}.{current}"
+            current = current + 1 if name in deduped else counts.get(name, 0)
+        deduped[index] = name
+        counts[name] = current + 1
+    return deduped
+
+
+def read_csv_stream(stream: BinaryIO) -> pd.DataFrame:
+    table = pa_csv.read_csv(
+        stream,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        # Comme `pd.read_csv` : "", "NA", "N/A", "null"... sont des valeurs manquantes
+        convert_options=pa_csv.ConvertOptions(strings_can_be_null=True),
+    )
+    # Un texte non UTF-8 (export cp1252 par exemple) est lu comme du binaire
+    binary_columns = [
+        field.name
+        for field in table.schema
+        if pa.types.is_binary(field.type) or pa.types.is_large_binary(field.type)
+    ]
+    if binary_columns:
+        raise ValueError(f"Colonnes non décodables en UTF-8 : {binary_columns}")
+    table = table.rename_columns(_dedupe_column_names(table.column_names))
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def read_excel_stream(stream: BinaryIO) -> pd.DataFrame:
+    """Lit un classeur avec le backend par défaut, puis passe les colonnes de texte en Arrow.
+
+    Le backend pyarrow de `read_excel` échoue sur les colonnes mixtes (identifiant
+    numérique puis « n/a », par exemple), qui restent donc en `object`.
+    """
+
+    df = pd.read_excel(stream)
+    for position, column in enumerate(df.columns):
+        if pd.api.types.infer_dtype(df.iloc[:, position], skipna=True) == "string":
+            df.isetitem(position, df.iloc[:, position].astype(pd.ArrowDtype(pa.string())))
+    return df
+
+
+def dataframe_from_upload(file: UploadFile) -> pd.DataFrame:
+    """Lit le fichier directement depuis son spool temporaire, sans copie en mémoire."""
+
+    stream = file.file
+    stream.seek(0)
     filename = file.filename or ""
     try:
         if filename.lower().endswith(".csv") or file.content_type == "text/csv":
-            df = pd.read_csv(buffer)
+            df = read_csv_stream(stream)
         elif filename.lower().endswith(".xlsx") or "excel" in (file.content_type or ""):
-            df = pd.read_excel(buffer)
+            df = read_excel_stream(stream)
         else:
             try:
-                df = pd.read_csv(buffer)
+                df = read_csv_stream(stream)
             except Exception as csv_error:  # pragma: no cover - fallback
-                buffer.seek(0)
-                df = pd.read_excel(buffer)
+                stream.seek(0)
+                df = read_excel_stream(stream)
                 LOGGER.warning("Lecture CSV impossible (%s), tentative Excel réussie", csv_error)
     except Exception as exc:  # pragma: no cover - logged for transparency
         LOGGER.exception("Erreur lors de la lecture du fichier uploadé")
@@ -172,40 +400,127 @@ def dataframe_from_upload(file: UploadFile, raw_bytes: bytes) -> pd.DataFrame:
         raise HTTPException(status_code=400, detail="Le fichier ne contient aucune donnée")
 
     df = df.dropna(how="all")
+    df.columns = df.columns.map(str)
     return df
 
 
+def _count_tokens_bincount(
+    sentiment_ids: np.ndarray, token_ids: np.ndarray, n_sentiments: int, vocab_size: int
+) -> np.ndarray:
+    flat_ids = sentiment_ids.astype(np.int64) * vocab_size + token_ids
+    return np.bincount(flat_ids, minlength=n_sentiments * vocab_size).reshape(n_sentiments, vocab_size)
+
+
+def _count_tokens_kernel(sentiment_ids: np.ndarray, token_ids: np.ndarray, n_sentiments: int, vocab_size: int) -> np.ndarray:
+    counts = np.zeros((n_sentiments, vocab_size), dtype=np.int64)
+    for position in range(token_ids.shape[0]):
+        counts[sentiment_ids[position], token_ids[position]] += 1
+    return counts
+
+
+# Matrice (sentiment, mot) des occurrences : boucle compilée par Numba si disponible
+_count_tokens = njit(cache=True)(_count_tokens_kernel) if njit is not None else _count_tokens_bincount
+
+
+def _top_counts(row: np.ndarray, first_seen: np.ndarray, top_n: int) -> np.ndarray:
+    """Indices des `top_n` plus grandes valeurs non nulles, par ordre décroissant.
+
+    Comme `Counter.most_common`, les ex æquo sont départagés par ordre de
+    première apparition (`first_seen`).
+    """
+
+    candidates = np.flatnonzero(row)
+    if 0 < top_n < candidates.size:
+        kth = candidates.size - top_n
+        cutoff = np.partition(row[candidates], kth)[kth]
+        candidates = candidates[row[candidates] >= cutoff]
+    order = np.lexsort((first_seen[candidates], -row[candidates]))
+    return candidates[order[:top_n]]
+
+
+def _encode_tokens(texts_by_sentiment: List[List[str]]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Encode en entiers les mots du nuage, dans leur ordre d'apparition.
+
+    Le texte n'est découpé que sur les espaces (`str.split`, en C) ; la regex et
+    le filtre des mots vides ne s'appliquent qu'une fois par fragment distinct.
+    Une occurrence de `_TOKEN_RE` ne traversant jamais d'espace, on obtient
+    exactement les mots de `_TOKEN_RE.findall` sur le texte complet.
+    """
+
+    chunks: List[str] = []
+    chunk_sentiments: List[np.ndarray] = []
+    for sentiment_id, texts in enumerate(texts_by_sentiment):
+        sentiment_chunks = " ".join(texts).lower().split()
+        chunks.extend(sentiment_chunks)
+        chunk_sentiments.append(np.full(len(sentiment_chunks), sentiment_id, dtype=np.int32))
+    chunk_ids, unique_chunks = pd.factorize(np.array(chunks, dtype=object))
+
+    stopwords = STOPWORDS
+    vocab: Dict[str, int] = {}
+    token_table: List[int] = []
+    tokens_per_chunk = np.zeros(len(unique_chunks), dtype=np.int64)
+    for index, chunk in enumerate(unique_chunks):
+        for token in _TOKEN_RE.findall(chunk):
+            if len(token) > 2 and token not in stopwords:
+                token_table.append(vocab.setdefault(token, len(vocab)))
+                tokens_per_chunk[index] += 1
+
+    # Déroule, pour chaque occurrence de fragment, ses mots retenus (0, 1 ou plus)
+    chunk_offsets = np.cumsum(tokens_per_chunk) - tokens_per_chunk
+    occurrence_counts = tokens_per_chunk[chunk_ids]
+    occurrence_offsets = np.cumsum(occurrence_counts) - occurrence_counts
+    positions = np.repeat(chunk_offsets[chunk_ids] - occurrence_offsets, occurrence_counts)
+    positions += np.arange(positions.size)
+    token_ids = np.asarray(token_table, dtype=np.int32)[positions]
+    sentiment_ids = np.repeat(np.concatenate(chunk_sentiments), occurrence_counts)
+    return sentiment_ids, token_ids, list(vocab)
+
+
 def compute_word_cloud(results: List[Dict[str, Any]], top_n: int = 30) -> Dict[str, List[Dict[str, Any]]]:
-    frequency_by_sentiment: Dict[str, Counter[str]] = {"positif": Counter(), "neutre": Counter(), "négatif": Counter()}
+    sentiments = ("positif", "neutre", "négatif")
+    word_cloud: Dict[str, List[Dict[str, Any]]] = {sentiment: [] for sentiment in sentiments}
+    if not results:
+        return word_cloud
+
+    texts_by_sentiment: Dict[str, List[str]] = {sentiment: [] for sentiment in sentiments}
     for item in results:
-        sentiment = item["sentiment"]
-        tokens = [
-            token
-            for token in re.findall(r"\b[\w']+\b", item["clean_text"].lower())
-            if len(token) > 2 and token not in STOPWORDS
+        texts_by_sentiment[item["sentiment"]].append(item["clean_text"])
+    sentiment_ids, token_ids, vocab = _encode_tokens(list(texts_by_sentiment.values()))
+    if token_ids.size == 0:
+        return word_cloud
+
+    counts = _count_tokens(sentiment_ids, token_ids, len(sentiments), len(vocab))
+
+    # Rang de première apparition de chaque (sentiment, mot) : `pd.factorize` est
+    # fondé sur une table de hachage et renvoie les valeurs dans l'ordre d'apparition.
+    _, first_seen_ids = pd.factorize(sentiment_ids.astype(np.int64) * len(vocab) + token_ids)
+    first_seen = np.full(counts.shape, first_seen_ids.size, dtype=np.int64)
+    first_seen.flat[first_seen_ids] = np.arange(first_seen_ids.size)
+
+    for sentiment_id, sentiment in enumerate(sentiments):
+        row = counts[sentiment_id]
+        word_cloud[sentiment] = [
+            {"text": vocab[token_id], "value": int(row[token_id])}
+            for token_id in _top_counts(row, first_seen[sentiment_id], top_n)
         ]
-        frequency_by_sentiment[sentiment].update(tokens)
-
-    return {
-        sentiment: [
-            {"text": word, "value": count}
-            for word, count in counter.most_common(top_n)
-        ]
-        for sentiment, counter in frequency_by_sentiment.items()
-    }
+    return word_cloud
 
 
 def summarise_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     total = len(results)
-    counts = Counter(item["sentiment"] for item in results)
-    average_score = round(sum(item["score"] for item in results) / total, 4) if total else 0.0
-    scores_by_sentiment: Dict[str, List[float]] = {"positif": [], "neutre": [], "négatif": []}
+    counts: Counter[str] = Counter()
+    sums_by_sentiment: Dict[str, float] = {"positif": 0.0, "neutre": 0.0, "négatif": 0.0}
+    total_score = 0.0
     for item in results:
-        scores_by_sentiment[item["sentiment"]].append(item["score"])
+        sentiment, score = item["sentiment"], item["score"]
+        counts[sentiment] += 1
+        sums_by_sentiment[sentiment] += score
+        total_score += score
 
+    average_score = round(total_score / total, 4) if total else 0.0
     mean_by_sentiment = {
-        sentiment: round(sum(values) / len(values), 4) if values else 0.0
-        for sentiment, values in scores_by_sentiment.items()
+        sentiment: round(score_sum / counts[sentiment], 4) if counts[sentiment] else 0.0
+        for sentiment, score_sum in sums_by_sentiment.items()
     }
 
     dominant_sentiment = counts.most_common(1)[0][0] if counts else None
@@ -238,32 +553,183 @@ def map_label(label: str) -> str:
     return LABEL_TRANSLATIONS.get(label, label)
 
 
-def build_results(df: pd.DataFrame, column: str) -> List[Dict[str, Any]]:
-    processed: List[Dict[str, Any]] = []
-    for raw_text in df[column].fillna(""):
-        raw_text = str(raw_text)
-        cleaned = clean_text(raw_text)
-        if not cleaned:
-            continue
-        prediction = PIPELINE(cleaned)[0]
-        sentiment = map_label(prediction["label"])
-        processed.append(
-            {
-                "text": raw_text,
-                "clean_text": cleaned,
-                "sentiment": sentiment,
-                "score": round(float(prediction["score"]), 4),
-            }
-        )
-    if not processed:
+class PredictionBatcher:
+    """Regroupe les demandes d'inférence concurrentes en lots partagés.
+
+    Les appels `/analyze` simultanés déposent leurs textes dans une file ; un
+    unique worker fusionne tout ce qui est en attente, exécute l'inférence dans
+    un thread puis redistribue les prédictions à chaque appelant.
+    """
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            pending = [await self._queue.get()]
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            texts = [text for batch, _ in pending for text in batch]
+            try:
+                predictions = await run_in_threadpool(predict_sentiments, texts)
+            except Exception as exc:  # pragma: no cover - remonté à chaque appelant
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            offset = 0
+            for batch, future in pending:
+                if not future.done():
+                    future.set_result(predictions[offset : offset + len(batch)])
+                offset += len(batch)
+
+
+PREDICTION_BATCHER = PredictionBatcher()
+
+
+def prepare_texts(df: pd.DataFrame, column: str) -> Tuple[List[str], List[str]]:
+    raw_texts = df[column].dropna().astype(str)
+    cleaned_texts = clean_series(raw_texts)
+    non_empty = cleaned_texts.str.len() > 0
+    raw_texts, cleaned_texts = raw_texts[non_empty], cleaned_texts[non_empty]
+    if cleaned_texts.empty:
         raise HTTPException(status_code=400, detail="Impossible d'analyser le sentiment : aucun texte valide")
-    return processed
+    return raw_texts.tolist(), cleaned_texts.tolist()
+
+
+async def build_results(df: pd.DataFrame, column: str) -> List[Dict[str, Any]]:
+    raw_texts, cleaned_texts = await run_in_threadpool(prepare_texts, df, column)
+    predictions = await PREDICTION_BATCHER.predict(cleaned_texts)
+    return [
+        {
+            "text": raw_text,
+            "clean_text": cleaned,
+            "sentiment": map_label(label),
+            "score": round(score, 4),
+        }
+        for raw_text, cleaned, (label, score) in zip(raw_texts, cleaned_texts, predictions)
+    ]
+
+
+def iter_results_csv(results: List[Dict[str, Any]], chunk_rows: int = CSV_EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Sérialise les résultats en CSV par blocs de `chunk_rows` lignes."""
+
+    for start in range(0, len(results), chunk_rows):
+        chunk = pd.DataFrame(results[start : start + chunk_rows])
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+class _DrainableSink:
+    """Flux d'écriture minimal dont le contenu est vidé au fur et à mesure."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_results_parquet(
+    results: List[Dict[str, Any]], chunk_rows: int = PARQUET_EXPORT_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """Sérialise les résultats en Parquet (Snappy), un row group par bloc de `chunk_rows` lignes."""
+
+    sink = _DrainableSink()
+    with pq.ParquetWriter(sink, RESULTS_SCHEMA, compression="snappy") as writer:
+        for start in range(0, len(results), chunk_rows):
+            writer.write_table(pa.Table.from_pylist(results[start : start + chunk_rows], schema=RESULTS_SCHEMA))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def write_upload_frame(df: pd.DataFrame, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = df.reset_index(drop=True)
+    # Arrow refuse les colonnes `object` mixtes : elles sont écrites en texte
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].map(str, na_action="ignore").astype(pd.ArrowDtype(pa.string()))
+    feather.write_feather(df, path, compression="uncompressed")
+
+
+def read_upload_column(path: Path, column: str) -> pd.DataFrame:
+    table = feather.read_table(path, columns=[column], memory_map=True)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def purge_stale_uploads(max_age: float = UPLOAD_TTL_SECONDS) -> None:
+    """Supprime les fichiers d'upload plus anciens que le TTL du cache.
+
+    Ils ne peuvent plus être référencés (fichiers laissés par un redémarrage) ;
+    les fichiers plus récents sont conservés car d'autres workers peuvent les utiliser.
+    """
+
+    if not UPLOAD_DIR.is_dir():
+        return
+    deadline = time.time() - max_age
+    for path in UPLOAD_DIR.glob("*.feather"):
+        try:
+            if path.stat().st_mtime < deadline:
+                path.unlink()
+        except FileNotFoundError:
+            continue
+
+
+class UploadStore(TTLCache):
+    """Uploads récents (chemin du fichier Arrow, résultats) ; le fichier est supprimé à l'éviction."""
+
+    @staticmethod
+    def _discard(entry: Dict[str, Any]) -> None:
+        Path(entry["path"]).unlink(missing_ok=True)
+
+    def popitem(self) -> Tuple[str, Dict[str, Any]]:
+        key, entry = super().popitem()
+        self._discard(entry)
+        return key, entry
+
+    def expire(self, time: Optional[float] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        expired = super().expire(time)
+        for _, entry in expired:
+            self._discard(entry)
+        return expired
 
 
-UPLOAD_STORE: Dict[str, Dict[str, Any]] = {}
+UPLOAD_STORE = UploadStore(maxsize=UPLOAD_MAX_ENTRIES, ttl=UPLOAD_TTL_SECONDS)
 
 
-app = FastAPI(title="Analyseur de sentiments français", version="1.0.0")
+app = FastAPI(
+    title="Analyseur de sentiments français",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -274,23 +740,40 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def warm_up_model() -> None:
+    """Charge le modèle et exécute une première inférence avant de servir."""
+
+    await run_in_threadpool(run_model, ["Bonjour"])
+
+
+@app.on_event("startup")
+async def purge_upload_dir() -> None:
+    """Nettoie les fichiers d'upload orphelins laissés par une exécution précédente."""
+
+    await run_in_threadpool(purge_stale_uploads)
+
+
 @app.post("/upload", response_model=UploadResponse)
 async def upload_file(file: UploadFile = File(...)) -> UploadResponse:
     """Stocke le fichier uploadé et retourne la colonne détectée."""
 
-    contents = await file.read()
-    if not contents:
+    if not file.size:
         raise HTTPException(status_code=400, detail="Le fichier est vide")
 
-    df = dataframe_from_upload(file, contents)
+    df = await run_in_threadpool(dataframe_from_upload, file)
     columns = detect_text_columns(df)
     detected_column = choose_default_column(columns)
     if not detected_column:
         raise HTTPException(status_code=422, detail="Aucune colonne de texte détectée")
 
     upload_id = str(uuid.uuid4())
+    path = UPLOAD_DIR / f"{upload_id}.feather"
+    await run_in_threadpool(write_upload_frame, df, path)
+    await run_in_threadpool(purge_stale_uploads)
     UPLOAD_STORE[upload_id] = {
-        "dataframe": df,
+        "path": path,
+        "columns": list(df.columns),
         "filename": file.filename,
     }
     LOGGER.info("Fichier %s stocké sous l'ID %s", file.filename, upload_id)
@@ -306,12 +789,15 @@ async def analyze(payload: AnalyzePayload = Body(...)) -> AnalyzeResponse:
     if not entry:
         raise HTTPException(status_code=404, detail="Upload introuvable, veuillez renvoyer le fichier")
 
-    df: pd.DataFrame = entry["dataframe"]
-    if payload.column not in df.columns:
+    if payload.column not in entry["columns"]:
         raise HTTPException(status_code=400, detail="Colonne sélectionnée invalide")
 
-    results = build_results(df, payload.column)
-    summary = summarise_results(results)
+    try:
+        df = await run_in_threadpool(read_upload_column, entry["path"], payload.column)
+    except FileNotFoundError as exc:  # entrée évincée entre-temps
+        raise HTTPException(status_code=404, detail="Upload introuvable, veuillez renvoyer le fichier") from exc
+    results = await build_results(df, payload.column)
+    summary = await run_in_threadpool(summarise_results, results)
     entry["results"] = results
     entry["summary"] = summary
 
@@ -324,15 +810,11 @@ async def download_results_csv(upload_id: str):
     if not entry or "results" not in entry:
         raise HTTPException(status_code=404, detail="Résultats introuvables. Lancez l'analyse au préalable.")
 
-    df = pd.DataFrame(entry["results"])
-    buffer = io.StringIO()
-    df.to_csv(buffer, index=False)
-    csv_bytes = buffer.getvalue().encode("utf-8")
     filename = entry.get("filename") or "resultats_sentiment.csv"
     download_name = f"resultats_{Path(filename).stem}.csv" if filename else "resultats_sentiment.csv"
 
     return StreamingResponse(
-        iter([csv_bytes]),
+        iter_results_csv(entry["results"]),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename={download_name}",
@@ -340,6 +822,24 @@ async def download_results_csv(upload_id: str):
     )
 
 
+@app.get("/results/{upload_id}/parquet")
+async def download_results_parquet(upload_id: str):
+    entry = UPLOAD_STORE.get(upload_id)
+    if not entry or "results" not in entry:
+        raise HTTPException(status_code=404, detail="Résultats introuvables. Lancez l'analyse au préalable.")
+
+    filename = entry.get("filename")
+    download_name = f"resultats_{Path(filename).stem}.parquet" if filename else "resultats_sentiment.parquet"
+
+    return StreamingResponse(
+        iter_results_parquet(entry["results"]),
+        media_type="application/vnd.apache.parquet",
+        headers={
+            "Content-Disposition": f"attachment; filename={download_name}",
+        },
+    )
+
+
 @app.get("/health")
 async def healthcheck() -> JSONResponse:
     return JSONResponse(content={"status": "ok"})
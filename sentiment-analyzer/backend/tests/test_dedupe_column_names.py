@@ -0,0 +1,14 @@
+import io
+
+import pandas as pd
+import pytest
+
+from app import _dedupe_column_names
+
+
+@pytest.mark.parametrize("header", ["text,text,,x", "a,a,a.1,a", ",,a,,a", "x,x,x,x.1,x.2"])
+def test_matches_pandas_read_csv_headers(header):
+    names = header.split(",")
+    csv = f"{header}\n{','.join('v' * len(names))}\n"
+
+    assert _dedupe_column_names(names) == list(pd.read_csv(io.StringIO(csv)).columns)
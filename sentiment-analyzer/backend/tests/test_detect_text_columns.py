@@ -0,0 +1,14 @@
+import pandas as pd
+
+from app import detect_text_columns
+
+
+def test_keeps_column_whose_long_values_raise_the_mean_above_two_words():
+    df = pd.DataFrame(
+        {
+            "notes": ["ok", "ok", "ok", "ceci est un commentaire assez long pour compter"],
+            "codes": ["A1", "B2", "C3", "D4"],
+        }
+    )
+
+    assert detect_text_columns(df) == ["notes"]
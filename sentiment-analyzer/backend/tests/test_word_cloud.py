@@ -0,0 +1,49 @@
+import random
+from collections import Counter
+
+from app import STOPWORDS, _TOKEN_RE, compute_word_cloud
+
+
+def counter_word_cloud(results, top_n):
+    """Implémentation de référence : un `Counter` par sentiment."""
+
+    frequency_by_sentiment = {"positif": Counter(), "neutre": Counter(), "négatif": Counter()}
+    for item in results:
+        frequency_by_sentiment[item["sentiment"]].update(
+            token
+            for token in _TOKEN_RE.findall(item["clean_text"].lower())
+            if len(token) > 2 and token not in STOPWORDS
+        )
+    return {
+        sentiment: [{"text": word, "value": count} for word, count in counter.most_common(top_n)]
+        for sentiment, counter in frequency_by_sentiment.items()
+    }
+
+
+def test_ties_at_cutoff_follow_first_appearance_within_sentiment():
+    results = [
+        {"sentiment": "neutre", "clean_text": "hibou chien"},
+        {"sentiment": "positif", "clean_text": "zèbre lapin"},
+        {"sentiment": "positif", "clean_text": "lapin chien"},
+        {"sentiment": "positif", "clean_text": "chien zèbre hibou"},
+    ]
+
+    word_cloud = compute_word_cloud(results, top_n=2)
+
+    assert word_cloud["positif"] == [{"text": "zèbre", "value": 2}, {"text": "lapin", "value": 2}]
+    assert word_cloud == counter_word_cloud(results, top_n=2)
+
+
+def test_matches_counter_most_common():
+    rng = random.Random(0)
+    words = [f"mot{index}" for index in range(40)] + ["l'été", "aujourd’hui", "très", "les", "'abc'", "x'yz"]
+    results = [
+        {
+            "sentiment": rng.choice(["positif", "neutre", "négatif"]),
+            "clean_text": " ".join(rng.choices(words, k=rng.randint(0, 12))),
+        }
+        for _ in range(300)
+    ]
+
+    for top_n in (1, 5, 30, 100):
+        assert compute_word_cloud(results, top_n=top_n) == counter_word_cloud(results, top_n)